@@ -448,15 +448,11 @@ def render_assignments_tab(user_id, admin_role, get_fresh_classes, get_fresh_sub
                     
                     col1, col2 = st.columns(2, vertical_alignment='bottom')
                     with col1:
-                        class_options = [cls['class_name'] for cls in classes]
-                        current_class = selected_assignment['class_name']
-                        current_index = class_options.index(current_class) if current_class in class_options else 0
+                        class_index = {cls['class_name']: i for i, cls in enumerate(classes)}
+                        current_index = class_index.get(selected_assignment['class_name'], 0)
                         
-                        new_class = st.selectbox("New Class", class_options, index=current_index, key="edit_assignment_class")
-                        
-                        selected_class_index = class_options.index(new_class)
-                        class_data = classes[selected_class_index]
-                        new_class_name = class_data['class_name']
+                        # Options are the class names themselves, so the selection is the name
+                        new_class_name = st.selectbox("New Class", list(class_index), index=current_index, key="edit_assignment_class")
                     
                     with col2:
                         if selected_assignment['subject_name']:
@@ -573,8 +569,7 @@ def render_assign_teacher_tab(get_fresh_classes, get_fresh_subjects, active_sess
         submitted_ct = st.form_submit_button("Assign Class Teacher")
         ActivityTracker.watch_form(submitted_ct)
         if submitted_ct:
-            ct_class_name = classes[class_options.index(ct_class)]['class_name']
-            if assign_teacher(ct_user_id, ct_class_name, active_session or '', None, 'class_teacher'):
+            if assign_teacher(ct_user_id, ct_class, active_session or '', None, 'class_teacher'):
                 st.success(f"✅ Class teacher assigned: {next(u['username'] for u in teacher_users if u['id'] == ct_user_id)}.")
                 st.rerun()
             else:
@@ -604,7 +599,7 @@ def render_assign_teacher_tab(get_fresh_classes, get_fresh_subjects, active_sess
     if st.session_state.selected_class_for_subject != selected_class:
         st.session_state.selected_class_for_subject = selected_class
 
-    class_name = classes[class_options.index(selected_class)]['class_name']
+    class_name = selected_class
     subjects = get_fresh_subjects(class_name)
 
     if not subjects:
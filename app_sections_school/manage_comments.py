@@ -4,46 +4,54 @@ import streamlit as st
 import pandas as pd
 import re
 from database_school import (
-    get_active_session, get_active_term_name, get_classes_for_session,
-    get_enrolled_students, create_comment, get_comment,
+    get_enrolled_students, create_comment, get_comments_by_class,
     delete_comment, create_psychomotor_rating, get_psychomotor_rating,
-    delete_psychomotor_rating, get_all_comment_templates, get_student_average,
-    get_head_teacher_comment_by_average, get_user_assignments
+    delete_psychomotor_rating, get_all_psychomotor_ratings, get_all_comment_templates, get_student_average,
+    get_head_teacher_comment_by_average
 )
 from main_utils import render_page_header, inject_login_css, render_class_term_session_selector
 from auth.activity_tracker import ActivityTracker
 
 # Psychomotor categories with their display names
-PSYCHOMOTOR_CATEGORIES = [
+PSYCHOMOTOR_CATEGORIES = (
     "Punctuality", "Neatness", "Honesty", "Cooperation",
     "Leadership", "Perseverance", "Politeness", "Obedience",
     "Attentiveness", "Attitude to work"
+)
+
+# Display name → psychomotor_ratings column, and the slider column each
+# category lands in (4 / 3 / 3 across the 1-0.1-1-0.1-1 layout)
+PSYCHOMOTOR_FIELDS = {c: c.lower().replace(' ', '_') for c in PSYCHOMOTOR_CATEGORIES}
+PSYCHOMOTOR_SLOTS  = (0,) * 4 + (2,) * 3 + (4,) * 3
+
+# Column order of the View Comments table (rows are built as tuples)
+VIEW_COMMENTS_COLUMNS = [
+    "S/N", "Student", "Average", "Class Teacher Comment",
+    "Head Teacher Comment", "Has Psychomotor"
 ]
 
 def manage_comments():
     """Manage report card comments and psychomotor ratings for students"""
-    # Initialize activity tracker
-    ActivityTracker.init()
-    
+    # Access checks run first and simply return: main.py owns the login flow,
+    # so a switch_page() back to it would only trigger another full rerun.
     if not st.session_state.get("authenticated", False):
         st.error("⚠️ Please log in first.")
-        st.switch_page("main.py")
-        return
-
-    if st.session_state.role not in ["superadmin", "admin", "class_teacher"]:
-        st.error("⚠️ Access denied. Admins and class teachers only.")
-        st.switch_page("main.py")
         return
 
     user_id = st.session_state.get('user_id', None)
     role = st.session_state.get('role', None)
 
-    if user_id is None or role is None:
+    if role not in ["superadmin", "admin", "class_teacher"]:
+        st.error("⚠️ Access denied. Admins and class teachers only.")
+        return
+
+    if user_id is None:
         st.error("⚠️ Session state missing user_id or role. Please log out and log in again.")
         return
 
-    st.set_page_config(page_title="Manage Comments & Ratings", layout="wide")
-    
+    # Initialize activity tracker
+    ActivityTracker.init()
+
     # Tab-based interface for different operations
     inject_login_css("templates/tabs_styles.css")
 
@@ -64,6 +72,10 @@ def manage_comments():
         st.warning(f"⚠️ No students enrolled for {class_name} - {session}.")
         return
 
+    # One class-wide fetch of comments and psychomotor ratings, shared by every tab
+    comments_map   = get_comments_by_class(class_name, term, session)
+    rated_students = {row[0] for row in get_all_psychomotor_ratings(class_name, term, session)}
+
     is_senior_class = bool(re.match(r"SSS [123].*$", class_name))
     is_junior_class = bool(re.match(r"JSS [123].*$", class_name))
     is_secondary_class = is_senior_class or is_junior_class
@@ -99,21 +111,21 @@ def manage_comments():
         if st.session_state.manage_comments_tab_tracker != 0:
             ActivityTracker.watch_tab("manage_comments_tabs", 0)
             st.session_state.manage_comments_tab_tracker = 0
-        render_view_delete_tab(students, class_name, term, session, is_secondary_class, is_primary_class, user_id, role)
+        render_view_delete_tab(students, comments_map, rated_students, class_name, term, session, is_secondary_class, is_primary_class, user_id, role)
 
     # Tab 2: Psychomotor & Comments
     with tabs[1]:
         if st.session_state.manage_comments_tab_tracker != 1:
             ActivityTracker.watch_tab("manage_comments_tabs", 1)
             st.session_state.manage_comments_tab_tracker = 1
-        render_psychomotor_comments_tab(role, students, class_name, term, session, is_secondary_class, is_primary_class, user_id)
+        render_psychomotor_comments_tab(role, students, comments_map, class_name, term, session, is_secondary_class, is_primary_class, user_id)
 
     # Tab 3: Batch CT Comments
     with tabs[2]:
         if st.session_state.manage_comments_tab_tracker != 2:
             ActivityTracker.watch_tab("manage_comments_tabs", 2)
             st.session_state.manage_comments_tab_tracker = 2
-        render_batch_add_ct_tab(students, class_name, term, session)
+        render_batch_add_ct_tab(students, comments_map, class_name, term, session)
 
     # Tab 4: Batch HT Comments (admin/superadmin only)
     if role in ["admin", "superadmin"]:
@@ -121,7 +133,7 @@ def manage_comments():
             if st.session_state.manage_comments_tab_tracker != 3:
                 ActivityTracker.watch_tab("manage_comments_tabs", 3)
                 st.session_state.manage_comments_tab_tracker = 3
-            render_batch_add_ht_tab(students, class_name, term, session, is_secondary_class, is_primary_class, user_id, role)
+            render_batch_add_ht_tab(students, comments_map, class_name, term, session, is_secondary_class, is_primary_class, user_id, role)
 
     # Tab 5: Batch Delete (last tab - index depends on role)
     with tabs[4 if role in ["admin", "superadmin"] else 3]:
@@ -133,38 +145,41 @@ def manage_comments():
             if st.session_state.manage_comments_tab_tracker != 3:
                 ActivityTracker.watch_tab("manage_comments_tabs", 3)
                 st.session_state.manage_comments_tab_tracker = 3
-        render_batch_delete_tab(students, class_name, term, session, is_secondary_class, is_primary_class)
+        render_batch_delete_tab(students, comments_map, rated_students, class_name, term, session, is_secondary_class, is_primary_class)
 
 
-def render_view_delete_tab(students, class_name, term, session, is_secondary_class, is_primary_class, user_id, role):
+def render_view_delete_tab(students, comments_map, rated_students, class_name, term, session, is_secondary_class, is_primary_class, user_id, role):
     """Render the View/Delete Comments tab"""
     st.subheader("View Comments and Psychomotor Ratings")
     
-    # Display existing comments
+    # Display existing comments; the same pass collects the students offered for deletion
     comments_data = []
+    students_with_data = []
     for idx, s in enumerate(students, 1):
-        comment = get_comment(s['student_name'], class_name, term, session)
-        psychomotor = get_psychomotor_rating(s['student_name'], class_name, term, session)
-        
-        # Get student average for display
-        avg = get_student_average(s['student_name'], class_name, session, term)
+        comment = comments_map.get(s['student_name'])
+        psychomotor = s['student_name'] in rated_students
         
         if comment or psychomotor:
+            students_with_data.append(s['student_name'])
+
+            # Get student average for display
+            avg = get_student_average(s['student_name'], class_name, session, term)
+
             ht_comment_display = comment['head_teacher_comment'] if comment and comment['head_teacher_comment'] else "-"
             is_custom = comment.get('head_teacher_comment_custom', 0) == 1 if comment else False
             
-            comments_data.append({
-                "S/N": str(idx),
-                "Student": s['student_name'],
-                "Average": f"{avg:.2f}" if avg > 0 else "-",
-                "Class Teacher Comment": comment['class_teacher_comment'] if comment and comment['class_teacher_comment'] else "-",
-                "Head Teacher Comment": ht_comment_display + (" (Custom)" if is_custom else " (Auto)") if ht_comment_display != "-" else "-",
-                "Has Psychomotor": "✓" if psychomotor else "✗"
-            })
+            comments_data.append((
+                str(idx),
+                s['student_name'],
+                f"{avg:.2f}" if avg > 0 else "-",
+                comment['class_teacher_comment'] if comment and comment['class_teacher_comment'] else "-",
+                ht_comment_display + (" (Custom)" if is_custom else " (Auto)") if ht_comment_display != "-" else "-",
+                "✓" if psychomotor else "✗"
+            ))
     
     if comments_data:
         st.dataframe(
-            pd.DataFrame(comments_data),
+            pd.DataFrame.from_records(comments_data, columns=VIEW_COMMENTS_COLUMNS),
             column_config={
                 "S/N": st.column_config.TextColumn("S/N", width=10),
                 "Student": st.column_config.TextColumn("Student", width=100),
@@ -185,14 +200,6 @@ def render_view_delete_tab(students, class_name, term, session, is_secondary_cla
     with st.expander("🗑️ Delete Comments/Ratings", expanded=False):
         st.markdown("### Delete Individual Student Data")
         
-        # Get students with comments or psychomotor ratings
-        students_with_data = []
-        for s in students:
-            comment = get_comment(s['student_name'], class_name, term, session)
-            psychomotor = get_psychomotor_rating(s['student_name'], class_name, term, session)
-            if comment or psychomotor:
-                students_with_data.append(s['student_name'])
-        
         if students_with_data:
             student_to_delete = st.selectbox(
                 "Select Student", 
@@ -227,7 +234,7 @@ def render_view_delete_tab(students, class_name, term, session, is_secondary_cla
             st.info("No data available to delete.")
 
 
-def render_psychomotor_comments_tab(role, students, class_name, term, session, is_secondary_class, is_primary_class, user_id):
+def render_psychomotor_comments_tab(role, students, comments_map, class_name, term, session, is_secondary_class, is_primary_class, user_id):
     """Render the Psychomotor Rating & Add Single Comment tab"""
     
     # Student selection
@@ -250,52 +257,18 @@ def render_psychomotor_comments_tab(role, students, class_name, term, session, i
     # Initialize ratings dictionary
     ratings = {}
     
-    # Create sliders for each category
-    col1, col2, col3, col4, col5 = st.columns([1, 0.1, 1, 0.1, 1])
-    with col1:
-        for i, category in enumerate(PSYCHOMOTOR_CATEGORIES[:4]):
-            default_value = 3
-            if existing_psychomotor and category.lower().replace(' ', '_') in existing_psychomotor:
-                default_value = existing_psychomotor[category.lower().replace(' ', '_')]
-            
-            slider_key = f"psycho_{selected_student}_{category}_{i}"
-            ratings[category] = st.slider(
-                category, 
-                1, 5, 
-                default_value, 
-                key=slider_key
-            )
-            ActivityTracker.watch_value(slider_key, ratings[category])
-            
-    with col3:
-        for i, category in enumerate(PSYCHOMOTOR_CATEGORIES[4:7]):
-            default_value = 3
-            if existing_psychomotor and category.lower().replace(' ', '_') in existing_psychomotor:
-                default_value = existing_psychomotor[category.lower().replace(' ', '_')]
-            
-            slider_key = f"psycho_{selected_student}_{category}_{i}"
-            ratings[category] = st.slider(
-                category, 
-                1, 5, 
-                default_value, 
-                key=slider_key
-            )
-            ActivityTracker.watch_value(slider_key, ratings[category])
-            
-    with col5:
-        for i, category in enumerate(PSYCHOMOTOR_CATEGORIES[7:]):
-            default_value = 3
-            if existing_psychomotor and category.lower().replace(' ', '_') in existing_psychomotor:
-                default_value = existing_psychomotor[category.lower().replace(' ', '_')]
-            
-            slider_key = f"psycho_{selected_student}_{category}_{i}"
-            ratings[category] = st.slider(
-                category, 
-                1, 5, 
-                default_value, 
-                key=slider_key
-            )
-            ActivityTracker.watch_value(slider_key, ratings[category])
+    # Create sliders for each category in a single pass over the column slots
+    slider_cols = st.columns([1, 0.1, 1, 0.1, 1])
+    existing_psychomotor = existing_psychomotor or {}
+    for i, (category, slot) in enumerate(zip(PSYCHOMOTOR_CATEGORIES, PSYCHOMOTOR_SLOTS)):
+        slider_key = f"psycho_{selected_student}_{category}_{i}"
+        ratings[category] = slider_cols[slot].slider(
+            category,
+            1, 5,
+            existing_psychomotor.get(PSYCHOMOTOR_FIELDS[category], 3),
+            key=slider_key
+        )
+        ActivityTracker.watch_value(slider_key, ratings[category])
     
     # Save button for psychomotor
     col_save1, col_space1, col_apply1 = st.columns(3)
@@ -325,8 +298,8 @@ def render_psychomotor_comments_tab(role, students, class_name, term, session, i
     with st.expander("Add/Edit Comments", expanded=True):
         st.markdown("### Student Comments")
         
-        # Get existing comments
-        existing_comment = get_comment(selected_student, class_name, term, session)
+        # Existing comment comes from the class-wide fetch — no extra query per selection
+        existing_comment = comments_map.get(selected_student)
         class_teacher_comment = ""
         head_teacher_comment = ""
         is_ht_custom = False
@@ -395,7 +368,7 @@ def render_psychomotor_comments_tab(role, students, class_name, term, session, i
                 ActivityTracker.update()
                 success_count = 0
                 for student in students:
-                    existing = get_comment(student['student_name'], class_name, term, session)
+                    existing = comments_map.get(student['student_name'])
                     ht_existing = existing['head_teacher_comment'] if existing else ""
                     ht_custom_existing = existing.get('head_teacher_comment_custom', 0) if existing else 0
                     if create_comment(student['student_name'], class_name, term, session, ct_comment, ht_existing, ht_custom_existing):
@@ -497,7 +470,7 @@ def render_psychomotor_comments_tab(role, students, class_name, term, session, i
                         ActivityTracker.update()
                         success_count = 0
                         for student in students:
-                            existing = get_comment(student['student_name'], class_name, term, session)
+                            existing = comments_map.get(student['student_name'])
                             ct_existing = existing['class_teacher_comment'] if existing else ""
                             if create_comment(student['student_name'], class_name, term, session, ct_existing, ht_comment_custom, 1):
                                 success_count += 1
@@ -505,7 +478,7 @@ def render_psychomotor_comments_tab(role, students, class_name, term, session, i
                         st.rerun()
 
 
-def render_batch_add_ct_tab(students, class_name, term, session):
+def render_batch_add_ct_tab(students, comments_map, class_name, term, session):
     """Render the Batch Add Class Teacher Comments tab"""
     st.subheader("Batch Add Class Teacher Comments")
     st.info("💡 Add or update Class Teacher comments for multiple students at once.")
@@ -524,7 +497,7 @@ def render_batch_add_ct_tab(students, class_name, term, session):
         with col1:
             student = students[i]
             student_name = student['student_name']
-            existing_comment = get_comment(student_name, class_name, term, session)
+            existing_comment = comments_map.get(student_name)
             existing_ct = existing_comment['class_teacher_comment'] or "" if existing_comment else ""
             
             # Initialize in session state if not exists
@@ -579,7 +552,7 @@ def render_batch_add_ct_tab(students, class_name, term, session):
             if i + 1 < len(students):
                 student = students[i + 1]
                 student_name = student['student_name']
-                existing_comment = get_comment(student_name, class_name, term, session)
+                existing_comment = comments_map.get(student_name)
                 existing_ct = existing_comment['class_teacher_comment'] or "" if existing_comment else ""
                 
                 # Initialize in session state if not exists
@@ -636,7 +609,7 @@ def render_batch_add_ct_tab(students, class_name, term, session):
         success_count = 0
         for student_name, ct_comment in st.session_state.batch_ct_comments.items():
             if ct_comment and ct_comment.strip():
-                existing = get_comment(student_name, class_name, term, session)
+                existing = comments_map.get(student_name)
                 existing_ht = existing['head_teacher_comment'] if existing else ""
                 ht_custom = existing.get('head_teacher_comment_custom', 0) if existing else 0
                 if create_comment(student_name, class_name, term, session, ct_comment, existing_ht, ht_custom):
@@ -651,7 +624,7 @@ def render_batch_add_ct_tab(students, class_name, term, session):
             st.warning("⚠️ No CT comments to save.")
 
 
-def render_batch_add_ht_tab(students, class_name, term, session, is_secondary_class, is_primary_class, user_id, role):
+def render_batch_add_ht_tab(students, comments_map, class_name, term, session, is_secondary_class, is_primary_class, user_id, role):
     """Render the Batch Add Head Teacher/Principal Comments tab"""
     ht_label = "Principal Comments" if is_secondary_class else "Head Teacher Comments"
     st.subheader(f"Batch Add {ht_label}")
@@ -729,7 +702,7 @@ def render_batch_add_ht_tab(students, class_name, term, session, is_secondary_cl
                     if avg > 0:
                         auto_comment = get_head_teacher_comment_by_average(avg)
                         if auto_comment:
-                            existing = get_comment(student_name, class_name, term, session)
+                            existing = comments_map.get(student_name)
                             ct_existing = existing['class_teacher_comment'] if existing else ""
                             if create_comment(student_name, class_name, term, session, ct_existing, auto_comment, 0):
                                 success_count += 1
@@ -768,7 +741,7 @@ def render_batch_add_ht_tab(students, class_name, term, session, is_secondary_cl
             with col1:
                 student = students[i]
                 student_name = student['student_name']
-                existing_comment = get_comment(student_name, class_name, term, session)
+                existing_comment = comments_map.get(student_name)
                 existing_ht = existing_comment['head_teacher_comment'] or "" if existing_comment else ""
                 
                 # Initialize in session state if not exists
@@ -820,7 +793,7 @@ def render_batch_add_ht_tab(students, class_name, term, session, is_secondary_cl
                 if i + 1 < len(students):
                     student = students[i + 1]
                     student_name = student['student_name']
-                    existing_comment = get_comment(student_name, class_name, term, session)
+                    existing_comment = comments_map.get(student_name)
                     existing_ht = existing_comment['head_teacher_comment'] or "" if existing_comment else ""
                     
                     # Initialize in session state if not exists
@@ -874,7 +847,7 @@ def render_batch_add_ht_tab(students, class_name, term, session, is_secondary_cl
             success_count = 0
             for student_name, ht_comment in st.session_state.batch_ht_comments.items():
                 if ht_comment and ht_comment.strip():
-                    existing = get_comment(student_name, class_name, term, session)
+                    existing = comments_map.get(student_name)
                     existing_ct = existing['class_teacher_comment'] if existing else ""
                     # All custom batch comments are marked as custom (1)
                     if create_comment(student_name, class_name, term, session, existing_ct, ht_comment, 1):
@@ -890,7 +863,7 @@ def render_batch_add_ht_tab(students, class_name, term, session, is_secondary_cl
                 st.warning(f"⚠️ No {ht_label} to save.")
 
 
-def render_batch_delete_tab(students, class_name, term, session, is_secondary_class, is_primary_class):
+def render_batch_delete_tab(students, comments_map, rated_students, class_name, term, session, is_secondary_class, is_primary_class):
     """Render the Batch Delete tab"""
     st.subheader("Batch Delete Operations")
     st.warning("⚠️ **DANGER ZONE**: These actions will permanently delete data for the selected class.")
@@ -904,7 +877,7 @@ def render_batch_delete_tab(students, class_name, term, session, is_secondary_cl
         with st.container(border=True):
             st.markdown("#### Clear All Comments")
             
-            comments_exist = any(get_comment(s['student_name'], class_name, term, session) for s in students)
+            comments_exist = bool(comments_map)
             
             if comments_exist:
                 st.error("This will delete all class teacher and head teacher comments for this class.")
@@ -937,7 +910,7 @@ def render_batch_delete_tab(students, class_name, term, session, is_secondary_cl
         with st.container(border=True):
             st.markdown("#### Clear All Psychomotor Ratings")
             
-            ratings_exist = any(get_psychomotor_rating(s['student_name'], class_name, term, session) for s in students)
+            ratings_exist = bool(rated_students)
             
             if ratings_exist:
                 st.error("This will delete all psychomotor ratings for this class.")
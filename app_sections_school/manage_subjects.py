@@ -2,12 +2,12 @@
 
 import streamlit as st
 import pandas as pd
-import time
 from database_school import (
-    get_all_classes, get_subjects_by_class, create_subject, delete_subject, update_subject, clear_all_subjects,
+    get_all_classes, get_subjects_by_class_cached, create_subjects_bulk, save_subject_changes, clear_all_subjects,
     get_active_session, get_active_term_name, open_class_for_session,
-    get_enrolled_students, get_student_selected_subjects, save_student_subject_selections,
-    get_all_student_subject_selections,
+    get_enrolled_students_cached, get_student_selected_subjects_cached, save_student_subject_selections,
+    save_student_subject_selections_bulk,
+    get_all_student_subject_selections, get_student_selection_summary_cached,
     get_all_sessions)
 from main_utils import (
     clean_input, create_metric_4col, inject_login_css,
@@ -15,6 +15,35 @@ from main_utils import (
     render_class_term_session_selector
 )
 from auth.activity_tracker import ActivityTracker
+from utils.paginators import streamlit_paginator
+
+# Classes whose students pick their own subject combination
+SENIOR_CLASS_PREFIXES = ("SSS 2", "SSS 3")
+
+SESSION_STATE_DEFAULTS = (
+    ("show_delete_subject_confirm", False),
+    ("subject_to_delete_info", None),
+    ("show_clear_subjects_confirm", False),
+    ("clear_subjects_info", None),
+    ("show_clear_selections_confirm", False),
+    ("clear_selections_info", None),
+    ("show_import_selections_confirm", False),
+    ("import_selections_info", None),
+    ("manage_subjects_tab_tracker", 0),
+)
+
+SUBJECTS_EDITOR_CONFIG = {
+    "S/N": st.column_config.NumberColumn("S/N", width=10),
+    "Subject Name": st.column_config.TextColumn("Subject Name", required=True),
+    "Delete": st.column_config.CheckboxColumn("Delete", width=60),
+}
+
+SELECTION_SUMMARY_CONFIG = {
+    "S/N": st.column_config.TextColumn("S/N", width=10),
+    "Student Name": st.column_config.TextColumn("Student Name", width=150),
+    "Selected Subjects": st.column_config.TextColumn("Selected Subjects", width=500),
+    "Number of Subjects": st.column_config.NumberColumn("Number of Subjects", width=80),
+}
 
 def add_subjects():
     # Initialize activity tracker
@@ -32,32 +61,12 @@ def add_subjects():
     user_id = st.session_state.get("user_id", None)
     role = st.session_state.get("role", None)
 
-    st.set_page_config(page_title="Manage Subjects", layout="wide")
-
     # Custom CSS for better table styling
     inject_login_css("templates/tabs_styles.css")
 
     # Subheader
     render_page_header("Manage Subject Combination")
 
-    # Initialize session state for delete confirmations
-    if "show_delete_subject_confirm" not in st.session_state:
-        st.session_state.show_delete_subject_confirm = False
-    if "subject_to_delete_info" not in st.session_state:
-        st.session_state.subject_to_delete_info = None
-    if "show_clear_subjects_confirm" not in st.session_state:
-        st.session_state.show_clear_subjects_confirm = False
-    if "clear_subjects_info" not in st.session_state:
-        st.session_state.clear_subjects_info = None
-    if "show_clear_selections_confirm" not in st.session_state:
-        st.session_state.show_clear_selections_confirm = False
-    if "clear_selections_info" not in st.session_state:
-        st.session_state.clear_selections_info = None
-    if "show_import_selections_confirm" not in st.session_state:
-        st.session_state.show_import_selections_confirm = False
-    if "import_selections_info" not in st.session_state:
-        st.session_state.import_selections_info = None
-
     # ── Session / term context ────────────────────────────────────────────────
     _ctx = render_class_term_session_selector("manage_subjects", allow_term_session_override=True)
     if _ctx is None:
@@ -67,28 +76,34 @@ def add_subjects():
     session    = _ctx["session"]
     ActivityTracker.watch_value("manage_subjects_class_selector", class_name)
 
+    # Initialize session state for confirmations and tab tracking
+    for key, default in SESSION_STATE_DEFAULTS:
+        st.session_state.setdefault(key, default)
+
     # Ensure class is open for this session (idempotent)
     open_class_for_session(class_name, session)
 
-    # Get existing subjects
-    subjects = get_subjects_by_class(class_name)
-
     # Check if this is SSS2 or SSS3 to show subject selection tab
-    import re
-    is_senior_class = bool(re.match(r"SSS [23].*$", class_name))
+    is_senior_class = class_name.startswith(SENIOR_CLASS_PREFIXES)
 
     # Confirmation dialog for deleting individual subject
     if st.session_state.show_delete_subject_confirm and st.session_state.subject_to_delete_info:
         @st.dialog("Confirm Subject Deletion")
         def confirm_delete_subject():
             subject_info = st.session_state.subject_to_delete_info
-            st.markdown(f"### Are you sure you want to delete this subject?")
-            st.error(f"**Subject Name:** {subject_info['subject_name']}")
+            subject_names = ", ".join(s["subject_name"] for s in subject_info["subjects"])
+            st.markdown(f"### Are you sure you want to delete {'this subject' if len(subject_info['subjects']) == 1 else 'these subjects'}?")
+            st.error(f"**Subject Name:** {subject_names}")
             st.error(f"**Class:** {subject_info['class_name']}")
             st.markdown("---")
             st.warning("⚠️ **This action cannot be undone!**")
             st.warning("• All scores for this subject will be permanently deleted")
             st.warning("• Student records associated with this subject will be removed")
+            if subject_info["renames"]:
+                st.info(
+                    "Your renames will be saved together with this deletion: "
+                    + ", ".join(f"{old} → {new}" for old, new in subject_info["renames"].values())
+                )
             
             col1, col2 = st.columns(2)
             with col1:
@@ -100,12 +115,17 @@ def add_subjects():
             with col2:
                 if st.button("❌ Delete Subject", key="confirm_delete_subject", type="primary", width="stretch"):
                     ActivityTracker.update()  # Track delete confirmation
-                    delete_subject(subject_info['subject_id'])
-                    st.session_state.show_delete_subject_confirm = False
-                    st.session_state.subject_to_delete_info = None
-                    st.success(f"✅ Subject '{subject_info['subject_name']}' deleted successfully.")
-                    time.sleep(1)
-                    st.rerun()
+                    if save_subject_changes(
+                        renames={subject_id: new for subject_id, (_, new) in subject_info["renames"].items()},
+                        delete_ids=[subject["subject_id"] for subject in subject_info["subjects"]],
+                        class_name=subject_info["class_name"],
+                    ):
+                        st.session_state.show_delete_subject_confirm = False
+                        st.session_state.subject_to_delete_info = None
+                        st.toast(f"✅ Subject '{subject_names}' deleted successfully.")
+                        st.rerun()
+                    else:
+                        st.error("⚠️ Failed to save changes. Nothing was renamed or deleted.")
         
         confirm_delete_subject()
 
@@ -138,8 +158,7 @@ def add_subjects():
                     st.session_state.show_clear_subjects_confirm = False
                     st.session_state.clear_subjects_info = None
                     if success:
-                        st.success(f"✅ All subjects cleared for {info['class_name']}!")
-                        time.sleep(1)
+                        st.toast(f"✅ All subjects cleared for {info['class_name']}!")
                         st.rerun()
                     else:
                         st.error("❌ Failed to clear subjects. Please try again.")
@@ -171,19 +190,15 @@ def add_subjects():
                 if st.button("🗑️ Clear All Selections", key="confirm_clear_selections", type="primary", width="stretch"):
                     ActivityTracker.update()  # Track clear confirmation
                     try:
-                        for student in info['students']:
-                            student_name = student["student_name"]
-                            save_student_subject_selections(
-                                student_name, 
-                                [], 
-                                info['class_name'], 
-                                info['term'], 
-                                info['session']
-                            )
+                        save_student_subject_selections_bulk(
+                            {student["student_name"]: [] for student in info['students']},
+                            info['class_name'],
+                            info['term'],
+                            info['session']
+                        )
                         st.session_state.show_clear_selections_confirm = False
                         st.session_state.clear_selections_info = None
-                        st.success("✅ All subject selections cleared successfully")
-                        time.sleep(1)
+                        st.toast("✅ All subject selections cleared successfully")
                         st.rerun()
                     except Exception as e:
                         st.error(f"❌ Error clearing selections: {str(e)}")
@@ -229,41 +244,34 @@ def add_subjects():
 
                         # Only import for students enrolled in the target term
                         target_student_names = {s["student_name"] for s in info["target_students"]}
-                        imported, skipped = 0, 0
-                        for student_name, subject_list in student_subject_map.items():
-                            if student_name in target_student_names:
-                                save_student_subject_selections(
-                                    student_name, subject_list,
-                                    info["class_name"], info["target_term"], info["target_session"]
-                                )
-                                imported += 1
-                            else:
-                                skipped += 1
+                        to_import = {
+                            student_name: subject_list
+                            for student_name, subject_list in student_subject_map.items()
+                            if student_name in target_student_names
+                        }
+                        skipped = len(student_subject_map) - len(to_import)
+                        imported = save_student_subject_selections_bulk(
+                            to_import, info["class_name"], info["target_term"], info["target_session"]
+                        )
 
                         st.session_state.show_import_selections_confirm = False
                         st.session_state.import_selections_info = None
-                        st.success(f"✅ Imported selections for {imported} student(s). {skipped} skipped (not enrolled in target term).")
-                        time.sleep(1)
+                        st.toast(f"✅ Imported selections for {imported} student(s). {skipped} skipped (not enrolled in target term).")
                         st.rerun()
                     except Exception as e:
                         st.error(f"❌ Error importing selections: {str(e)}")
 
         confirm_import_selections()
 
+    # Read after the dialogs: a confirm that writes reruns before reaching here
+    subjects = get_subjects_by_class_cached(class_name)
+    subject_names = [s["subject_name"] for s in subjects]
+
     # Tabs for different operations
-    if is_senior_class:
-        tabs = st.tabs(["View/Edit Subjects", "Add Subjects", "Clear All Subjects", "View Selections", "Manage Subject Selections"])
-        current_tab = st.session_state.get("manage_subjects_current_tab", 0)
-        
-        # Detect tab changes by checking which tab content is being rendered
-        if "manage_subjects_tab_tracker" not in st.session_state:
-            st.session_state.manage_subjects_tab_tracker = 0
-    else:
-        tabs = st.tabs(["View/Edit Subjects", "Add Subjects", "Clear All Subjects"])
-        current_tab = st.session_state.get("manage_subjects_current_tab", 0)
-        
-        if "manage_subjects_tab_tracker" not in st.session_state:
-            st.session_state.manage_subjects_tab_tracker = 0
+    tabs = st.tabs(
+        ["View/Edit Subjects", "Add Subjects", "Clear All Subjects"]
+        + (["View Selections", "Manage Subject Selections"] if is_senior_class else [])
+    )
 
     # Tab 1: View/Edit Subjects
     with tabs[0]:
@@ -274,65 +282,75 @@ def add_subjects():
             
         st.subheader("View/Edit Subjects")
         if subjects:
-            # Display class metrics
-            # st.metric("Subjects", len(subjects))
-            
-            # Table header using columns
-            header_cols = st.columns([0.5, 5, 1, 1])
-            header_cols[0].markdown("**S/N**")
-            header_cols[1].markdown("**Subject Name**")
-            header_cols[2].markdown("**Update**")
-            header_cols[3].markdown("**Delete**")
-
-            for i, subject in enumerate(subjects):
-                col1, col2, col3, col4 = st.columns([0.5, 5, 1, 1], gap="small", vertical_alignment="bottom")
-                
-                # Display serial number (S/N)
-                col1.markdown(f"**{i+1}**")
-
-                # Editable field for subject name
-                new_subject_name = col2.text_input(
-                    "Subject",
-                    value=subject["subject_name"],
-                    key=f"subject_name_{i}",
-                    label_visibility="collapsed"
-                ).upper()
-
-                # Update button (disabled for subject_teacher)
-                update_disabled = role == "subject_teacher"
-                if col3.button("💾", key=f"update_{i}", disabled=update_disabled):
-                    ActivityTracker.update()  # Track update action
-                    new_subject_name_upper = clean_input(new_subject_name, "subject").strip().upper()
-                    # Check for duplicates (excluding the current subject)
-                    if any(
-                        other_subj["subject_name"].strip().upper() == new_subject_name_upper and
-                        other_subj["id"] != subject["id"]
-                        for other_subj in subjects
-                    ):
-                        st.markdown(f'<div class="error-container">⚠️ A subject with name \'{new_subject_name_upper}\' already exists for this class.</div>', unsafe_allow_html=True)
-                    else:
-                        success = update_subject(
-                            subject_id=subject["id"],
-                            new_subject_name=new_subject_name_upper,
-                            class_name=class_name,
-                        )
-                        if success:
-                            st.markdown(f'<div class="success-container">✅ Updated to {new_subject_name_upper}</div>', unsafe_allow_html=True)
-                            st.rerun()
-                        else:
-                            st.markdown(f'<div class="error-container">⚠️ Failed to update \'{new_subject_name_upper}\'. It may already exist.</div>', unsafe_allow_html=True)
+            # One data_editor for the whole table instead of 4 widgets per subject.
+            # Rows are indexed by subject id so edits map straight back to the DB.
+            read_only = role == "subject_teacher"  # subject_teacher cannot edit or delete
+            subjects_df = pd.DataFrame(
+                {
+                    "S/N": range(1, len(subjects) + 1),
+                    "Subject Name": subject_names,
+                    "Delete": False,
+                },
+                index=[s["id"] for s in subjects],
+            )
+            # Edits are held client-side until Save, so typing in a cell
+            # does not rerun the page.
+            with st.form(f"subjects_edit_form_{class_name}", border=False):
+                # Keyed on the current rows so pending edits reset once the data changes
+                editor_key = f"subjects_editor_{class_name}_{hash(tuple(subjects_df['Subject Name']))}"
+                edited_df = st.data_editor(
+                    subjects_df,
+                    column_config=SUBJECTS_EDITOR_CONFIG,
+                    disabled=True if read_only else ["S/N"],
+                    hide_index=True,
+                    width="stretch",
+                    key=editor_key,
+                )
+
+                save_clicked = st.form_submit_button("💾 Save Changes", disabled=read_only)
 
-                # Delete button (disabled for subject_teacher)
-                delete_disabled = role == "subject_teacher"
-                if col4.button("❌", key=f"delete_{i}", disabled=delete_disabled):
-                    ActivityTracker.update()  # Track delete initiation
+            if save_clicked:
+                ActivityTracker.update()  # Track update action
+                original_names = subjects_df["Subject Name"]
+                new_names = edited_df["Subject Name"].map(
+                    lambda name: clean_input(name if isinstance(name, str) else "", "subject").upper()
+                )
+                to_delete = edited_df.index[edited_df["Delete"]]
+                renamed = new_names[new_names != original_names].drop(to_delete, errors="ignore")
+
+                # Duplicate check against the names that remain after the edit
+                final_names = new_names.drop(to_delete)
+                duplicates = sorted(set(final_names[final_names.duplicated()]))
+                if (renamed == "").any():
+                    st.error("⚠️ Subject names cannot be empty.")
+                elif duplicates:
+                    st.error(f"⚠️ A subject with name '{', '.join(duplicates)}' already exists for this class.")
+                elif len(to_delete):
+                    # Deletions go through the confirmation dialog, which then
+                    # applies renames and deletes together in one transaction
                     st.session_state.show_delete_subject_confirm = True
                     st.session_state.subject_to_delete_info = {
-                        "subject_id": subject["id"],
-                        "subject_name": subject["subject_name"],
+                        "subjects": [
+                            {"subject_id": int(subject_id), "subject_name": original_names[subject_id]}
+                            for subject_id in to_delete
+                        ],
+                        "renames": {
+                            int(subject_id): (original_names[subject_id], new_name)
+                            for subject_id, new_name in renamed.items()
+                        },
                         "class_name": class_name,
                     }
                     st.rerun()
+                elif len(renamed):
+                    if save_subject_changes(
+                        renames={int(subject_id): new_name for subject_id, new_name in renamed.items()},
+                        delete_ids=[],
+                        class_name=class_name,
+                    ):
+                        st.toast(f"✅ Updated to {', '.join(renamed)}")
+                        st.rerun()
+                    else:
+                        st.error("⚠️ Failed to save changes. No subjects were renamed.")
         else:
             st.info("No subjects found for this class. Add subjects in the 'Add Subjects' tab.")
 
@@ -347,11 +365,7 @@ def add_subjects():
         if role == "subject_teacher":
             st.info("Subject Teachers cannot add new subjects.")
         else:
-            # Initialize form counter for clearing input
-            if 'subject_form_counter' not in st.session_state:
-                st.session_state.subject_form_counter = 0
-                
-            with st.form(f"add_subject_form_{st.session_state.subject_form_counter}"):
+            with st.form("add_subject_form", clear_on_submit=True):
                 new_subjects_input = st.text_area(
                     "Enter subject names (one per line)",
                     height=150,
@@ -363,29 +377,23 @@ def add_subjects():
                 ActivityTracker.watch_form(submitted)
                 
                 if submitted:
-                    new_subjects_raw = [clean_input(s, "subject").strip().upper() for s in new_subjects_input.split("\n") if s.strip()]
-                    unique_new_subjects = list(set(new_subjects_raw))
-                    existing_subject_names = {s["subject_name"].upper() for s in subjects}
-                    if not unique_new_subjects:
-                        st.markdown('<div class="error-container">⚠️ Please enter at least one valid subject.</div>', unsafe_allow_html=True)
+                    lines = pd.Series(new_subjects_input.split("\n"))
+                    new_subjects = (
+                        lines[lines.str.strip() != ""]
+                        .map(lambda s: clean_input(s, "subject"))
+                        .str.upper()
+                        .drop_duplicates()
+                    )
+                    if new_subjects.empty:
+                        st.error("⚠️ Please enter at least one valid subject.")
                     else:
-                        added, skipped = [], []
-                        for subject in unique_new_subjects:
-                            if subject in existing_subject_names:
-                                skipped.append(subject)
-                            else:
-                                success = create_subject(subject, class_name)
-                                if success:
-                                    added.append(subject)
-                                else:
-                                    skipped.append(subject)
+                        # The UNIQUE(class_name, subject_name) constraint reports duplicates
+                        added, skipped = create_subjects_bulk(new_subjects.tolist(), class_name)
                         if added:
-                            st.markdown(f'<div class="success-container">✅ Successfully added: {", ".join(added)}</div>', unsafe_allow_html=True)
-                            # Clear the form by incrementing counter
-                            st.session_state.subject_form_counter += 1
+                            st.toast(f"✅ Successfully added: {', '.join(added)}")
                             st.rerun()
                         if skipped:
-                            st.markdown(f'<div class="error-container">⚠️ Skipped (duplicates or failed to add): {", ".join(skipped)}</div>', unsafe_allow_html=True)
+                            st.error(f"⚠️ Skipped (duplicates or failed to add): {', '.join(skipped)}")
     
     # Tab 3: Clear All Subjects
     with tabs[2]:
@@ -413,6 +421,9 @@ def add_subjects():
 
     # Tab 4: Student Subject Selection (only for senior classes)
     if is_senior_class:
+        # Enrolment is shared by both selection tabs
+        students = get_enrolled_students_cached(class_name, session, term)
+
         # Tab 4: View Selections
         with tabs[3]:
             if st.session_state.manage_subjects_tab_tracker != 3:
@@ -420,42 +431,26 @@ def add_subjects():
                 st.session_state.manage_subjects_tab_tracker = 3
 
             st.subheader("View Subject Selections")
-            students = get_enrolled_students(class_name, session, term)
             if not students:
                 st.warning(f"⚠️ No students enrolled in {class_name} for {session}.")
             elif not subjects:
                 st.warning("⚠️ No subjects available. Please add subjects first.")
             else:
-                selections = get_all_student_subject_selections(class_name, term, session)
-                if selections:
-                    selection_summary = {}
-                    for student_name, subject_name in selections:
-                        if student_name not in selection_summary:
-                            selection_summary[student_name] = []
-                        selection_summary[student_name].append(subject_name)
-
-                    summary_data = []
-                    for i, student in enumerate(students, 1):
-                        student_name = student["student_name"]
-                        selected_subjects = selection_summary.get(student_name, [])
-                        summary_data.append({
-                            "S/N": str(i),
-                            "Student Name": student_name,
-                            "Selected Subjects": ", ".join(selected_subjects) if selected_subjects else "None",
-                            "Number of Subjects": len(selected_subjects)
-                        })
-
-                    st.dataframe(
-                        pd.DataFrame(summary_data),
-                        column_config={
-                            "S/N": st.column_config.TextColumn("S/N", width=10),
-                            "Student Name": st.column_config.TextColumn("Student Name", width=150),
-                            "Selected Subjects": st.column_config.TextColumn("Selected Subjects", width=500),
-                            "Number of Subjects": st.column_config.NumberColumn("Number of Subjects", width=80)
-                        },
-                        hide_index=True,
-                        width="stretch",
-                        height=35 * len(summary_data) + 38,
+                # One row per enrolled student, grouped by the database
+                selection_summary = get_student_selection_summary_cached(class_name, term, session)
+                if any(subject_count for _, _, subject_count in selection_summary):
+                    student_names, selected_subjects, subject_counts = zip(*selection_summary)
+                    summary_df = pd.DataFrame({
+                        "S/N": [str(i) for i in range(1, len(student_names) + 1)],
+                        "Student Name": student_names,
+                        "Selected Subjects": [subjects or "None" for subjects in selected_subjects],
+                        "Number of Subjects": subject_counts,
+                    })
+
+                    streamlit_paginator(
+                        summary_df,
+                        table_name="subject_selections",
+                        column_config=SELECTION_SUMMARY_CONFIG,
                     )
                 else:
                     st.info("No subject selections made yet.")
@@ -469,47 +464,13 @@ def add_subjects():
             if role == "subject_teacher":
                 st.info("Subject Teachers cannot manage student subject selections.")
             else:
-                students = get_enrolled_students(class_name, session, term)
                 if not students:
                     st.warning(f"⚠️ No students enrolled in {class_name} for {session}.")
                 elif not subjects:
                     st.warning("⚠️ No subjects available. Please add subjects first.")
                 else:
                     # Individual student subject selection
-                    st.markdown("### Individual Student Selections")
-                    student_names = [s["student_name"] for s in students]
-                    selected_student = st.selectbox("Select Student", [""] + student_names, key="student_select")
-                    ActivityTracker.watch_value("student_select_dropdown", selected_student)
-
-                    if selected_student:
-                        st.markdown(f"#### Subject Selection for **{selected_student}**")
-                        current_selections = get_student_selected_subjects(selected_student, class_name, term, session)
-                        subject_names = [s["subject_name"] for s in subjects]
-
-                        col1, col2 = st.columns(2)
-                        selected_subjects = []
-
-                        for i, subject_name in enumerate(subject_names):
-                            is_selected = subject_name in current_selections
-                            col = col1 if i % 2 == 0 else col2
-                            checkbox_key = f"subject_{selected_student}_{subject_name}"
-                            checkbox_value = col.checkbox(subject_name, value=is_selected, key=checkbox_key)
-                            ActivityTracker.watch_value(checkbox_key, checkbox_value)
-                            if checkbox_value:
-                                selected_subjects.append(subject_name)
-
-                        if st.button("💾 Save Subject Selections", key="save_selections"):
-                            ActivityTracker.update()
-                            try:
-                                save_student_subject_selections(
-                                    selected_student, selected_subjects, class_name, term, session
-                                )
-                                st.success(f"✅ Subject selections saved for {selected_student}")
-                                if "student_select" in st.session_state:
-                                    del st.session_state["student_select"]
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"❌ Error saving selections: {str(e)}")
+                    render_student_selection(students, subject_names, class_name, term, session)
 
                     st.markdown("---")
 
@@ -522,12 +483,12 @@ def add_subjects():
                         if st.button("📚 Assign All Subjects", key="assign_all"):
                             ActivityTracker.update()
                             try:
-                                subject_names = [s["subject_name"] for s in subjects]
-                                for student in students:
-                                    save_student_subject_selections(
-                                        student["student_name"], subject_names, class_name, term, session
+                                with st.spinner(f"Assigning {len(subject_names)} subjects to {len(students)} students..."):
+                                    save_student_subject_selections_bulk(
+                                        {student["student_name"]: subject_names for student in students},
+                                        class_name, term, session
                                     )
-                                st.success("✅ All subjects assigned to all students")
+                                st.toast("✅ All subjects assigned to all students")
                                 st.rerun()
                             except Exception as e:
                                 st.error(f"❌ Error in batch assignment: {str(e)}")
@@ -586,4 +547,48 @@ def add_subjects():
                             }
                             st.rerun()
                         if is_same:
-                            st.caption("⚠️ Select a different term or session.")
\ No newline at end of file
+                            st.caption("⚠️ Select a different term or session.")
+
+
+@st.fragment
+def render_student_selection(students, subject_names, class_name, term, session):
+    """Per-student subject checkboxes. A fragment, so picking a student reruns only this section."""
+    st.markdown("### Individual Student Selections")
+    student_names = [s["student_name"] for s in students]
+    selected_student = st.selectbox("Select Student", [""] + student_names, key="student_select")
+    ActivityTracker.watch_value("student_select_dropdown", selected_student)
+
+    if selected_student:
+        st.markdown(f"#### Subject Selection for **{selected_student}**")
+        current_selections = get_student_selected_subjects_cached(selected_student, class_name, term, session)
+
+        # Ticks are held in the form until Save
+        with st.form(f"student_selection_form_{selected_student}", border=False):
+            col1, col2 = st.columns(2)
+            selected_subjects = []
+            checkbox_values = {}
+
+            for i, subject_name in enumerate(subject_names):
+                is_selected = subject_name in current_selections
+                col = col1 if i % 2 == 0 else col2
+                checkbox_key = f"subject_{selected_student}_{subject_name}"
+                checkbox_value = col.checkbox(subject_name, value=is_selected, key=checkbox_key)
+                checkbox_values[checkbox_key] = checkbox_value
+                if checkbox_value:
+                    selected_subjects.append(subject_name)
+            ActivityTracker.watch_values(f"subject_checkboxes_{selected_student}", checkbox_values)
+
+            save_clicked = st.form_submit_button("💾 Save Subject Selections")
+
+        if save_clicked:
+            ActivityTracker.update()
+            try:
+                save_student_subject_selections(
+                    selected_student, selected_subjects, class_name, term, session
+                )
+                st.toast(f"✅ Subject selections saved for {selected_student}")
+                if "student_select" in st.session_state:
+                    del st.session_state["student_select"]
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error saving selections: {str(e)}")
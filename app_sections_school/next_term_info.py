@@ -1,37 +1,43 @@
 # app_sections/next_term_info.py
 
 import streamlit as st
+import pandas as pd
 from datetime import date
+from functools import lru_cache
 import json
 
 from database_school import (
-    get_all_classes, get_active_session, get_active_term_name,
-    get_next_term_info,
+    get_all_classes_cached, get_active_session, get_active_term_name,
     create_or_update_next_term_info,
     delete_next_term_info,
-    get_all_next_term_info
+    get_all_next_term_info_cached
 )
 from main_utils import render_page_header, inject_login_css
 
 
+# current term -> (next term, years to add to the session)
+TERM_TRANSITIONS = {
+    "1st Term": ("2nd Term", 0),
+    "2nd Term": ("3rd Term", 0),
+    "3rd Term": ("1st Term", 1),
+}
+TERM_OPTIONS = list(TERM_TRANSITIONS)
+TERM_INDEX = {term: i for i, term in enumerate(TERM_OPTIONS)}
+
+
+@lru_cache(maxsize=64)
 def calculate_next_term(current_term, current_session):
     """Intelligently calculate the next term and session"""
-    term_map = {"1st Term": "2nd Term", "2nd Term": "3rd Term", "3rd Term": "1st Term"}
-    next_term = term_map.get(current_term, "1st Term")
-    
-    # If moving from 3rd term to 1st term, increment session
-    if current_term == "3rd Term":
+    next_term, year_step = TERM_TRANSITIONS.get(current_term, ("1st Term", 0))
+
+    # Only moving from 3rd term to 1st term increments the session
+    if year_step:
         year_parts = current_session.split('/')
         if len(year_parts) == 2:
-            start_year = int(year_parts[0])
-            end_year = int(year_parts[1])
-            next_session = f"{start_year + 1}/{end_year + 1}"
-        else:
-            next_session = current_session
-    else:
-        next_session = current_session
-    
-    return next_term, next_session
+            start_year, end_year = year_parts
+            return next_term, f"{int(start_year) + year_step}/{int(end_year) + year_step}"
+
+    return next_term, current_session
 
 
 def next_term_info():
@@ -50,7 +56,7 @@ def next_term_info():
     inject_login_css("templates/tabs_styles.css")
     render_page_header("Next Term Information")
 
-    classes = get_all_classes()
+    classes = get_all_classes_cached()
     if not classes:
         st.warning("⚠️ No classes available. Please create a class first.")
         return
@@ -58,6 +64,10 @@ def next_term_info():
     # Extract unique class names (no term/session — classes are permanent)
     all_class_names = sorted({c["class_name"] for c in classes})
 
+    # Every saved configuration, keyed for the form lookup below
+    all_infos = get_all_next_term_info_cached()
+    infos_by_term = {(info['term'], info['session']): info for info in all_infos}
+
     # Use active session/term to determine current context
     current_session = get_active_session()
     current_term = get_active_term_name()
@@ -83,11 +93,10 @@ def next_term_info():
             col1, col2, col3 = st.columns(3)
             with col1:
                 # Manual override for term
-                term_options = ["1st Term", "2nd Term", "3rd Term"]
-                default_term_idx = term_options.index(next_term) if next_term in term_options else 0
+                default_term_idx = TERM_INDEX.get(next_term, 0)
                 selected_next_term = st.selectbox(
                     "Next Term",
-                    term_options,
+                    TERM_OPTIONS,
                     index=default_term_idx,
                     key="next_term_select"
                 )
@@ -99,7 +108,7 @@ def next_term_info():
                     value=next_session,
                     key="next_session_select"
                 )
-            existing = get_next_term_info(selected_next_term, selected_next_session)
+            existing = infos_by_term.get((selected_next_term, selected_next_session))
             
             if existing:
                 st.success(f"✏️ Editing: **{selected_next_term}** — **{selected_next_session}**")
@@ -119,23 +128,25 @@ def next_term_info():
         
         with st.form("fees_form"):
             existing_fees = existing.get('fees', {}) if existing else {}
-            fees = {}
-            
-            # Display in 2-column grid
-            for i in range(0, len(all_class_names), 4):
-                cols = st.columns(4)
-                for j, col in enumerate(cols):
-                    idx = i + j
-                    if idx < len(all_class_names):
-                        class_name = all_class_names[idx]
-                        pre_value = existing_fees.get(class_name, "0")
-                        with col:
-                            fees[class_name] = st.text_input(
-                                class_name,
-                                value=str(pre_value),
-                                key=f"fee_{class_name}"
-                            )
-            
+
+            # One editable row per class; keyed on term/session so switching reloads the saved fees
+            fees_df = pd.DataFrame({
+                "Class": all_class_names,
+                "Fee": [str(existing_fees.get(class_name, "0")) for class_name in all_class_names],
+            })
+            edited_fees = st.data_editor(
+                fees_df,
+                column_config={
+                    "Class": st.column_config.TextColumn("Class"),
+                    "Fee": st.column_config.TextColumn("Fee (₦)"),
+                },
+                disabled=["Class"],
+                hide_index=True,
+                width="stretch",
+                key=f"fees_editor_{selected_next_term}_{selected_next_session}",
+            )
+            fees = dict(zip(edited_fees["Class"], edited_fees["Fee"].fillna("").astype(str)))
+
             submit_all = st.form_submit_button("💾 Save All Information", type="primary", width=300)
 
     # Handle submissions
@@ -155,167 +166,169 @@ def next_term_info():
     with tab2:
         st.subheader("All Next Term Configurations")
         
-        # Initialize session state for delete dialogs
-        if 'show_delete_basic_dialog' not in st.session_state:
-            st.session_state.show_delete_basic_dialog = False
-        if 'show_delete_fees_dialog' not in st.session_state:
-            st.session_state.show_delete_fees_dialog = False
-        if 'config_to_delete' not in st.session_state:
-            st.session_state.config_to_delete = None
-        if 'delete_type' not in st.session_state:
-            st.session_state.delete_type = None
-        
-        all_infos = get_all_next_term_info()
-        
-        if not all_infos:
-            st.info("📭 No configurations found yet. Create one in the 'Manage Information' tab.")
-            return
+        render_all_configurations(all_infos, user_id)
 
-        # Search filter
-        search = st.text_input(
-            "🔍 Search",
-            placeholder="Search by term or session...",
-            key="search_configs"
-        )
-        
-        # Filter entries
-        if search:
-            filtered = [
-                info for info in all_infos
-                if search.lower() in info['term'].lower() or search.lower() in info['session'].lower()
-            ]
-        else:
-            filtered = all_infos
 
-        if not filtered:
-            st.info("📭 No configurations found. Try adjusting your search.")
-        else:
-            st.success(f"📊 Found **{len(filtered)}** configuration(s)")
+@st.fragment
+def render_all_configurations(all_infos, user_id):
+    """Configuration cards and their delete dialogs. Opening a dialog reruns only this fragment."""
+    # Initialize session state for delete dialogs
+    if 'show_delete_basic_dialog' not in st.session_state:
+        st.session_state.show_delete_basic_dialog = False
+    if 'show_delete_fees_dialog' not in st.session_state:
+        st.session_state.show_delete_fees_dialog = False
+    if 'config_to_delete' not in st.session_state:
+        st.session_state.config_to_delete = None
+    if 'delete_type' not in st.session_state:
+        st.session_state.delete_type = None
 
-            # Display configurations in cards
-            for info in filtered:
-                with st.container(border=True):
-                    # Main header
-                    col1, col2 = st.columns([2.5, 1])
-                    with col1:
-                        st.markdown(f"##### Next term Information")
-                    with col2:
-                        st.caption(f"🕒 Last updated: {info['updated_at']}")
-                    
-                    # Basic Information Container
-                    with st.container(border=True):
-                        col_label, col_content, col_action = st.columns([1, 6, 0.5])
-                        
-                        with col_label:
-                            st.markdown("**Basic Info**")
-                        
-                        with col_content:
-                            col_1_1, col_1_2 = st.columns(2)
-                            with col_1_1:
-                                st.markdown(f"**Next Term — Session:** {info['term']} — {info['session']}")
-                            with col_1_2:
-                                st.markdown(f"**Next Term Begins:** {info['next_term_begins']}")
-                        
-                        with col_action:
-                            if st.button("🗑️", key=f"del_basic_{info['id']}", help="Delete basic information", type="primary"):
-                                st.session_state.config_to_delete = info
-                                st.session_state.delete_type = "basic"
-                                st.session_state.show_delete_basic_dialog = True
-                                st.rerun()
-                    
-                    # Fee Structure Container
-                    fees_map = json.loads(info.get('fees_json', '{}'))
-                    
-                    with st.container(border=True):
-                        col_label, col_content, col_action = st.columns([1, 6, 0.5])
-                        
-                        with col_label:
-                            st.markdown("**Fee Structure**")
-                        
-                        with col_content:
-                            if fees_map:
-                                # Display fees in compact grid
-                                fee_items = list(fees_map.items())
-                                for i in range(0, len(fee_items), 4):
-                                    fee_cols = st.columns(4)
-                                    for j, col in enumerate(fee_cols):
-                                        idx = i + j
-                                        if idx < len(fee_items):
-                                            class_name, amount = fee_items[idx]
-                                            with col:
-                                                st.caption(f"**{class_name}:** ₦{amount}")
-                            else:
-                                st.caption("_No fees configured_")
-                        
-                        with col_action:
-                            if fees_map:
-                                if st.button("🗑️", key=f"del_fees_{info['id']}", help="Delete fee structure", type="primary"):
-                                    st.session_state.config_to_delete = info
-                                    st.session_state.delete_type = "fees"
-                                    st.session_state.show_delete_fees_dialog = True
-                                    st.rerun()
-
-        # Delete Basic Information Confirmation Dialog
-        if st.session_state.show_delete_basic_dialog and st.session_state.config_to_delete:
-            info = st.session_state.config_to_delete
-            
-            @st.dialog("⚠️ Confirm Delete Basic Information")
-            def confirm_delete_basic():
-                st.warning(f"Are you sure you want to delete the entire configuration for:")
-                st.info(f"**{info['term']} — {info['session']}**")
-                st.error("⚠️ This will delete ALL information including fees for this term/session!")
-                
-                col1, col2 = st.columns(2)
+    if not all_infos:
+        st.info("📭 No configurations found yet. Create one in the 'Manage Information' tab.")
+        return
+
+    # Search filter
+    search = st.text_input(
+        "🔍 Search",
+        placeholder="Search by term or session...",
+        key="search_configs"
+    )
+
+    # Filter entries
+    if search:
+        search_lower = search.lower()
+        filtered = [info for info in all_infos if search_lower in info['search_key']]
+    else:
+        filtered = all_infos
+
+    if not filtered:
+        st.info("📭 No configurations found. Try adjusting your search.")
+    else:
+        st.success(f"📊 Found **{len(filtered)}** configuration(s)")
+
+        # Display configurations in cards
+        for info in filtered:
+            with st.container(border=True):
+                # Main header
+                col1, col2 = st.columns([2.5, 1])
                 with col1:
-                    if st.button("✅ Yes, Delete Everything", type="primary", width='stretch'):
-                        if delete_next_term_info(info['term'], info['session']):
-                            st.success("✅ Configuration deleted successfully!")
-                            st.session_state.show_delete_basic_dialog = False
-                            st.session_state.config_to_delete = None
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to delete configuration")
-                
+                    st.markdown(f"##### Next term Information")
                 with col2:
-                    if st.button("❌ Cancel", width='stretch'):
+                    st.caption(f"🕒 Last updated: {info['updated_at']}")
+
+                # Basic Information Container
+                with st.container(border=True):
+                    col_label, col_content, col_action = st.columns([1, 6, 0.5])
+
+                    with col_label:
+                        st.markdown("**Basic Info**")
+
+                    with col_content:
+                        col_1_1, col_1_2 = st.columns(2)
+                        with col_1_1:
+                            st.markdown(f"**Next Term — Session:** {info['term']} — {info['session']}")
+                        with col_1_2:
+                            st.markdown(f"**Next Term Begins:** {info['next_term_begins']}")
+
+                    with col_action:
+                        if st.button("🗑️", key=f"del_basic_{info['id']}", help="Delete basic information", type="primary"):
+                            st.session_state.config_to_delete = info
+                            st.session_state.delete_type = "basic"
+                            st.session_state.show_delete_basic_dialog = True
+                            st.rerun(scope="fragment")
+
+                # Fee Structure Container (parsed once per DB version by the cache)
+                fees_map = info['fees']
+
+                with st.container(border=True):
+                    col_label, col_content, col_action = st.columns([1, 6, 0.5])
+
+                    with col_label:
+                        st.markdown("**Fee Structure**")
+
+                    with col_content:
+                        if fees_map:
+                            # Display fees in compact grid
+                            fee_items = list(fees_map.items())
+                            for i in range(0, len(fee_items), 4):
+                                fee_cols = st.columns(4)
+                                for j, col in enumerate(fee_cols):
+                                    idx = i + j
+                                    if idx < len(fee_items):
+                                        class_name, amount = fee_items[idx]
+                                        with col:
+                                            st.caption(f"**{class_name}:** ₦{amount}")
+                        else:
+                            st.caption("_No fees configured_")
+
+                    with col_action:
+                        if fees_map:
+                            if st.button("🗑️", key=f"del_fees_{info['id']}", help="Delete fee structure", type="primary"):
+                                st.session_state.config_to_delete = info
+                                st.session_state.delete_type = "fees"
+                                st.session_state.show_delete_fees_dialog = True
+                                st.rerun(scope="fragment")
+
+    # Delete Basic Information Confirmation Dialog
+    if st.session_state.show_delete_basic_dialog and st.session_state.config_to_delete:
+        info = st.session_state.config_to_delete
+
+        @st.dialog("⚠️ Confirm Delete Basic Information")
+        def confirm_delete_basic():
+            st.warning(f"Are you sure you want to delete the entire configuration for:")
+            st.info(f"**{info['term']} — {info['session']}**")
+            st.error("⚠️ This will delete ALL information including fees for this term/session!")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("✅ Yes, Delete Everything", type="primary", width='stretch'):
+                    if delete_next_term_info(info['term'], info['session']):
+                        st.success("✅ Configuration deleted successfully!")
                         st.session_state.show_delete_basic_dialog = False
                         st.session_state.config_to_delete = None
                         st.rerun()
-            
-            confirm_delete_basic()
+                    else:
+                        st.error("❌ Failed to delete configuration")
 
-        # Delete Fees Confirmation Dialog
-        if st.session_state.show_delete_fees_dialog and st.session_state.config_to_delete:
-            info = st.session_state.config_to_delete
-            
-            @st.dialog("⚠️ Confirm Delete Fee Structure")
-            def confirm_delete_fees():
-                st.warning(f"Are you sure you want to delete the fee structure for:")
-                st.info(f"**{info['term']} — {info['session']}**")
-                st.caption("This will clear all class fees but keep the basic information.")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("✅ Yes, Delete Fees", type="primary", width='stretch'):
-                        # Update with empty fees
-                        if create_or_update_next_term_info(
-                            info['term'], 
-                            info['session'], 
-                            info['next_term_begins'], 
-                            json.dumps({}), 
-                            user_id
-                        ):
-                            st.success("✅ Fee structure deleted successfully!")
-                            st.session_state.show_delete_fees_dialog = False
-                            st.session_state.config_to_delete = None
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to delete fee structure")
-                
-                with col2:
-                    if st.button("❌ Cancel", width='stretch'):
+            with col2:
+                if st.button("❌ Cancel", width='stretch'):
+                    st.session_state.show_delete_basic_dialog = False
+                    st.session_state.config_to_delete = None
+                    st.rerun()
+
+        confirm_delete_basic()
+
+    # Delete Fees Confirmation Dialog
+    if st.session_state.show_delete_fees_dialog and st.session_state.config_to_delete:
+        info = st.session_state.config_to_delete
+
+        @st.dialog("⚠️ Confirm Delete Fee Structure")
+        def confirm_delete_fees():
+            st.warning(f"Are you sure you want to delete the fee structure for:")
+            st.info(f"**{info['term']} — {info['session']}**")
+            st.caption("This will clear all class fees but keep the basic information.")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("✅ Yes, Delete Fees", type="primary", width='stretch'):
+                    # Update with empty fees
+                    if create_or_update_next_term_info(
+                        info['term'], 
+                        info['session'], 
+                        info['next_term_begins'], 
+                        json.dumps({}), 
+                        user_id
+                    ):
+                        st.success("✅ Fee structure deleted successfully!")
                         st.session_state.show_delete_fees_dialog = False
                         st.session_state.config_to_delete = None
                         st.rerun()
-            
-            confirm_delete_fees()
\ No newline at end of file
+                    else:
+                        st.error("❌ Failed to delete fee structure")
+
+            with col2:
+                if st.button("❌ Cancel", width='stretch'):
+                    st.session_state.show_delete_fees_dialog = False
+                    st.session_state.config_to_delete = None
+                    st.rerun()
+
+        confirm_delete_fees()
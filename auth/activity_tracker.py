@@ -40,6 +40,14 @@ class ActivityTracker:
             # First time seeing this widget, just store the value without updating
             st.session_state[f"_prev_{key}"] = hash_value
 
+    @staticmethod
+    def watch_values(key, values):
+        """
+        Detect a change in any of a group of widgets (e.g. a checkbox grid).
+        Tracks the whole {widget_key: value} mapping under one key.
+        """
+        ActivityTracker.watch_value(key, tuple(values.items()))
+
     @staticmethod
     def watch_tab(key, current_tab):
         """
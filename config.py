@@ -32,6 +32,8 @@ DB_CONFIG = {
     "schools_dir": os.path.join("data", "schools"),
     "backup_dir":  os.path.join("data", "backups"),
     "enable_foreign_keys": True,
+    "cache_ttl":           300,   # seconds — see database_school/cache.py
+    "pool_size":           5,     # idle connections kept per school DB
 }
 
 LOG_CONFIG = {
@@ -365,6 +365,8 @@ def delete_school(
         conn.close()
 
         if delete_db_file and os.path.exists(db_path):
+            from database_school.connection import close_pool
+            close_pool(db_path)
             os.remove(db_path)
             logger.warning(f"School database file deleted: {db_path}")
 
@@ -85,6 +85,7 @@ from .scores import (
 from .comments import (
     create_comment,
     get_comment,
+    get_comments_by_class,
     delete_comment,
 )
 
@@ -99,8 +100,10 @@ from .psychomotor import (
 # ── Subjects ─────────────────────────────────────────────────────────────────
 from .subjects import (
     create_subject,
+    create_subjects_bulk,
     get_subjects_by_class,
     update_subject,
+    save_subject_changes,
     delete_subject,
     clear_all_subjects,
 )
@@ -117,7 +120,9 @@ from .score_system import (
 from .student_subjects import (
     get_student_selected_subjects,
     save_student_subject_selections,
+    save_student_subject_selections_bulk,
     get_all_student_subject_selections,
+    get_student_selection_summary,
 )
 
 # ── Next term info ────────────────────────────────────────────────────────────
@@ -162,8 +167,19 @@ from .utils import (
     database_health_check,
 )
 
+# ── Cached reads (keyed on school DB path + file version) ─────────────────────
+from .cache import (
+    get_all_classes_cached,
+    get_subjects_by_class_cached,
+    get_enrolled_students_cached,
+    get_student_selected_subjects_cached,
+    get_student_selection_summary_cached,
+    get_all_next_term_info_cached,
+)
+
 # ── Connection (re-exported for callers that need a raw connection) ────────────
 from .connection import (
     get_connection,
     get_db_connection,
+    close_pool,
 )
\ No newline at end of file
@@ -0,0 +1,136 @@
+# database/cache.py
+"""
+Cached reads for hot, slowly-changing school data.
+
+Pages re-run top to bottom on every widget interaction, so lookups such as
+the class list or a class's subjects were re-queried on each keystroke.
+These wrappers serve them from st.cache_data instead.
+
+st.cache_data is shared by every session in the process, so each entry is
+keyed on:
+  - the resolved school DB path  → tenants never share entries
+  - data_version(db_path)        → stat() of the SQLite file (+ its WAL)
+
+Any committed write — from this page, another page or another user —
+changes the file stats and therefore the key. Two same-size writes within
+one mtime tick can leave the token unchanged, so the write helpers for
+cached tables also call clear_cached_reads() after they commit. The TTL
+only bounds how long superseded entries stay in memory.
+"""
+
+import os
+import streamlit as st
+from config import DB_CONFIG
+from .connection import get_db_path
+from .classes import get_all_classes
+from .subjects import get_subjects_by_class
+from .students import get_enrolled_students
+from .next_term_data import get_all_next_term_info
+from .student_subjects import (
+    get_student_selection_summary, get_student_selected_subjects,
+)
+
+CACHE_TTL = DB_CONFIG.get("cache_ttl", 300)
+
+
+def data_version(db_path=None) -> tuple:
+    """
+    Cheap change token for a school database.
+
+    Returns the (mtime_ns, size) of the database file and of its -wal file
+    (None for a file that does not exist). Commits in rollback-journal mode
+    rewrite the main file; in WAL mode they append to the -wal file.
+    """
+    path = get_db_path(db_path)
+    token = []
+    for p in (path, f"{path}-wal"):
+        try:
+            stat = os.stat(p)
+            token.append((stat.st_mtime_ns, stat.st_size))
+        except (OSError, TypeError):
+            token.append(None)
+    return tuple(token)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _all_classes(db_path, version):
+    return get_all_classes()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _subjects_by_class(db_path, version, class_name):
+    return get_subjects_by_class(class_name)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _enrolled_students(db_path, version, class_name, session, term):
+    return get_enrolled_students(class_name, session, term)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _student_selected_subjects(db_path, version, student_name, class_name, term, session):
+    return get_student_selected_subjects(student_name, class_name, term, session)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _student_selection_summary(db_path, version, class_name, term, session):
+    return get_student_selection_summary(class_name, term, session)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _all_next_term_info(db_path, version):
+    infos = get_all_next_term_info()
+    # Lower-cased "term\nsession" for the configuration search box
+    for info in infos:
+        info['search_key'] = f"{info['term']}\n{info['session']}".lower()
+    return infos
+
+
+def get_all_classes_cached() -> list:
+    """Cached get_all_classes() for the active school."""
+    db_path = get_db_path()
+    return _all_classes(db_path, data_version(db_path))
+
+
+def get_subjects_by_class_cached(class_name: str) -> list:
+    """Cached get_subjects_by_class() for the active school."""
+    db_path = get_db_path()
+    return _subjects_by_class(db_path, data_version(db_path), class_name)
+
+
+def get_enrolled_students_cached(class_name: str, session: str, term: str) -> list:
+    """Cached get_enrolled_students() for the active school."""
+    db_path = get_db_path()
+    return _enrolled_students(db_path, data_version(db_path), class_name, session, term)
+
+
+def get_student_selected_subjects_cached(student_name, class_name, term, session) -> list:
+    """Cached get_student_selected_subjects() for the active school."""
+    db_path = get_db_path()
+    return _student_selected_subjects(
+        db_path, data_version(db_path), student_name, class_name, term, session
+    )
+
+
+def get_student_selection_summary_cached(class_name, term, session) -> list:
+    """Cached get_student_selection_summary() for the active school."""
+    db_path = get_db_path()
+    return _student_selection_summary(
+        db_path, data_version(db_path), class_name, term, session
+    )
+
+
+def get_all_next_term_info_cached() -> list:
+    """Cached get_all_next_term_info() for the active school."""
+    db_path = get_db_path()
+    return _all_next_term_info(db_path, data_version(db_path))
+
+
+def clear_cached_reads() -> None:
+    """Drop every cached read. Called by write helpers after they commit."""
+    for cached in (
+        _all_classes, _subjects_by_class, _enrolled_students,
+        _student_selected_subjects, _student_selection_summary,
+        _all_next_term_info,
+    ):
+        cached.clear()
@@ -146,17 +146,29 @@ def delete_class(class_name: str) -> tuple:
 def open_class_for_session(class_name: str, session: str) -> bool:
     """
     Open a class for an academic session (creates class_sessions row).
-    Idempotent — safe to call even if already open (INSERT OR IGNORE).
+    Idempotent — safe to call even if already open.
     Both class_name and session must exist in their parent tables.
+
+    Pages call this on every rerun, so the existence check is done in the
+    INSERT itself: a bare INSERT OR IGNORE still rewrites sqlite_sequence on
+    this AUTOINCREMENT table, which would touch the DB file each time and
+    defeat the file-version token used by database_school.cache.
     """
+    from .cache import clear_cached_reads
+
     conn = get_connection()
     cursor = conn.cursor()
     try:
         cursor.execute("""
             INSERT OR IGNORE INTO class_sessions (class_name, session)
-            VALUES (?, ?)
-        """, (class_name, session))
+            SELECT ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM class_sessions WHERE class_name = ? AND session = ?
+            )
+        """, (class_name, session, class_name, session))
         conn.commit()
+        if cursor.rowcount:
+            clear_cached_reads()
         logger.info(f"'{class_name}' opened for session '{session}'")
         return True
     except sqlite3.IntegrityError as e:
@@ -95,6 +95,38 @@ def get_comment(student_name, class_name, term, session):
     return dict(row) if row else None
 
 
+def get_comments_by_class(class_name, term, session):
+    """
+    Get comments for every enrolled student of a class in one query.
+
+    Returns:
+        dict mapping student_name → dict with class_teacher_comment,
+        head_teacher_comment, head_teacher_comment_custom. Students
+        without a comment are absent from the dict.
+    """
+    conn = get_connection()
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT css.student_name, c.class_teacher_comment,
+               c.head_teacher_comment, c.head_teacher_comment_custom
+        FROM   comments c
+        JOIN   class_session_students css ON css.id = c.enrollment_id
+        JOIN   class_sessions cs ON cs.id = css.class_session_id
+        WHERE  cs.class_name = ? AND c.term = ? AND cs.session = ?
+    """, (class_name, term, session))
+    rows = cursor.fetchall()
+    conn.close()
+    return {
+        row['student_name']: {
+            'class_teacher_comment':       row['class_teacher_comment'],
+            'head_teacher_comment':        row['head_teacher_comment'],
+            'head_teacher_comment_custom': row['head_teacher_comment_custom'],
+        }
+        for row in rows
+    }
+
+
 def delete_comment(student_name, class_name, term, session):
     """
     Delete a comment for a student.
@@ -14,7 +14,9 @@ Resolution priority for which DB to connect to:
 
 import sqlite3
 import os
+import queue
 import logging
+import threading
 from contextlib import contextmanager
 from typing import Optional
 import streamlit as st
@@ -63,6 +65,71 @@ def get_db_path(db_path: Optional[str] = None) -> str:
     return DB_PATH
 
 
+# ─────────────────────────────────────────────
+# Connection pool
+# ─────────────────────────────────────────────
+#
+# Every helper opens a connection, runs a query or two and closes it, and a
+# page render calls dozens of helpers. Instead of reopening the file (and
+# re-running the PRAGMA) each time, close() hands the connection back to a
+# small per-database pool and the next get_connection() reuses it.
+
+POOL_SIZE = DB_CONFIG.get("pool_size", 5)
+
+_pools: dict = {}
+_pools_lock = threading.Lock()
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() returns it to its pool."""
+
+    _pool_path = None
+    _in_pool = False
+
+    def close(self):
+        if self._in_pool:
+            return  # already handed back — ignore a repeated close()
+        pool = _pools.get(self._pool_path)
+        try:
+            if pool is None:
+                raise queue.Full
+            # Reset per-checkout state: discard uncommitted work, default factory
+            self.rollback()
+            self.row_factory = sqlite3.Row
+            self._in_pool = True
+            pool.put_nowait(self)
+        except (queue.Full, sqlite3.Error):
+            self._in_pool = False
+            super().close()
+
+
+def _get_pool(path: str) -> queue.LifoQueue:
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = queue.LifoQueue(maxsize=POOL_SIZE)
+        return pool
+
+
+def close_pool(db_path: Optional[str] = None) -> None:
+    """
+    Close the pooled connections for one database (or all when db_path is
+    None). Call before deleting or overwriting a school's .db file so no
+    idle handle keeps the old file open.
+    """
+    with _pools_lock:
+        paths = [db_path] if db_path else list(_pools)
+        pools = [_pools.pop(p) for p in paths if p in _pools]
+    for pool in pools:
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                break
+            conn._in_pool = False
+            sqlite3.Connection.close(conn)
+
+
 # ─────────────────────────────────────────────
 # Core connection helpers
 # ─────────────────────────────────────────────
@@ -71,6 +138,9 @@ def get_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
     """
     Get a database connection for the resolved school database.
 
+    Connections come from a per-database pool; calling close() returns
+    them to it (rolling back anything left uncommitted).
+
     Args:
         db_path: Optional explicit path. When None, resolves automatically
                  via get_db_path() — reading from session state if available.
@@ -79,11 +149,27 @@ def get_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
         sqlite3.Connection with Row factory and foreign keys enabled.
     """
     path = get_db_path(db_path)
+    pool = _get_pool(path)
+    try:
+        conn = pool.get_nowait()
+        conn._in_pool = False
+        return conn
+    except queue.Empty:
+        pass
+
     os.makedirs(os.path.dirname(path) if os.path.dirname(path) else ".", exist_ok=True)
-    conn = sqlite3.connect(path)
+    # Pooled connections are reused by later script-run threads, but only
+    # ever checked out by one thread at a time.
+    conn = sqlite3.connect(path, factory=PooledConnection, check_same_thread=False)
     conn.execute("PRAGMA foreign_keys = ON")
+    # WAL databases stay corruption-safe with NORMAL sync and skip the
+    # per-commit fsync of the WAL. Rollback-journal files keep FULL.
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+        conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
     conn.row_factory = sqlite3.Row
     # conn.row_factory = dict_factory
+    conn._pool_path = path
     return conn
 
 
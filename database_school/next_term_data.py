@@ -2,6 +2,7 @@
 
 """Next term information operations for report cards"""
 
+import json
 import logging
 from .connection import get_connection
 
@@ -9,6 +10,8 @@ logger = logging.getLogger(__name__)
 
 
 def create_or_update_next_term_info(term, session, next_term_begins, fees_json, user_id):
+    from .cache import clear_cached_reads
+
     conn = get_connection()
     cursor = conn.cursor()
     try:
@@ -19,6 +22,7 @@ def create_or_update_next_term_info(term, session, next_term_begins, fees_json,
         """, (term, session, next_term_begins, fees_json, user_id))
         
         conn.commit()
+        clear_cached_reads()
         return True
     except Exception as e:
         logger.error(f"Error saving next term info: {e}")
@@ -42,7 +46,6 @@ def get_next_term_info(term, session):
         columns = ['id', 'term', 'session', 'next_term_begins', 'fees_json', 'updated_at', 'updated_by']
         info = dict(zip(columns, row))
         # Parse fees_json string back to dictionary
-        import json
         info['fees'] = json.loads(info.get('fees_json', '{}'))
         return info
     return None
@@ -64,12 +67,15 @@ def get_all_next_term_info():
     for row in rows:
         columns = ['id', 'term', 'session', 'next_term_begins', 'fees_json', 'updated_at', 'updated_by']
         info = dict(zip(columns, row))
+        info['fees'] = json.loads(info.get('fees_json') or '{}')
         infos.append(info)
     
     return infos
 
 
 def delete_next_term_info(term, session):
+    from .cache import clear_cached_reads
+
     conn = get_connection()
     cursor = conn.cursor()
     try:
@@ -78,6 +84,7 @@ def delete_next_term_info(term, session):
             WHERE term = ? AND session = ?
         """, (term, session))
         conn.commit()
+        clear_cached_reads()
         return True
     except Exception as e:
         logger.error(f"Error deleting next term info: {e}")
@@ -46,6 +46,8 @@ def save_student_subject_selections(student_name, selected_subjects,
         selected_subjects: list of subject name strings
         class_name, term, session: context
     """
+    from .cache import clear_cached_reads
+
     enrollment_id = get_enrollment_id(student_name, class_name, session, term)
     if enrollment_id is None:
         logger.error(
@@ -64,23 +66,125 @@ def save_student_subject_selections(student_name, selected_subjects,
     """, (enrollment_id, term))
 
     # Insert new selections
-    for subject in selected_subjects:
-        cursor.execute("""
-            INSERT OR IGNORE INTO student_subject_selections
-                (enrollment_id, student_name, class_name, session,
-                 term, subject_name)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (enrollment_id, student_name, class_name, session,
-              term, subject))
+    cursor.executemany("""
+        INSERT OR IGNORE INTO student_subject_selections
+            (enrollment_id, student_name, class_name, session,
+             term, subject_name)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [(enrollment_id, student_name, class_name, session, term, subject)
+          for subject in selected_subjects])
 
     conn.commit()
     conn.close()
+    clear_cached_reads()
     logger.info(
         f"Subject selections saved for {student_name} / {term}: "
         f"{len(selected_subjects)} subjects"
     )
 
 
+def save_student_subject_selections_bulk(selections_by_student,
+                                          class_name, term, session):
+    """
+    Save/update subject selections for many students in one transaction.
+    Replaces each listed student's existing selections for this term.
+
+    Args:
+        selections_by_student: dict of student_name → list of subject names
+                               (an empty list clears that student's selections)
+        class_name, term, session: context
+
+    Returns:
+        int: number of students whose selections were saved.
+    """
+    from .cache import clear_cached_reads
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        # Resolve every enrollment for the class/term in one query
+        cursor.execute("""
+            SELECT css.student_name, css.id
+            FROM   class_session_students css
+            JOIN   class_sessions cs ON cs.id = css.class_session_id
+            WHERE  cs.class_name = ? AND cs.session = ? AND css.term = ?
+        """, (class_name, session, term))
+        enrollment_ids = dict(cursor.fetchall())
+
+        targets = [
+            (student_name, enrollment_ids[student_name], subjects)
+            for student_name, subjects in selections_by_student.items()
+            if student_name in enrollment_ids
+        ]
+        missing = len(selections_by_student) - len(targets)
+        if missing:
+            logger.error(
+                f"save_student_subject_selections_bulk: {missing} student(s) "
+                f"not enrolled in '{class_name}' / '{session}' / {term}"
+            )
+
+        cursor.executemany("""
+            DELETE FROM student_subject_selections
+            WHERE enrollment_id = ? AND term = ?
+        """, [(enrollment_id, term) for _, enrollment_id, _ in targets])
+
+        cursor.executemany("""
+            INSERT OR IGNORE INTO student_subject_selections
+                (enrollment_id, student_name, class_name, session,
+                 term, subject_name)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (enrollment_id, student_name, class_name, session, term, subject)
+            for student_name, enrollment_id, subjects in targets
+            for subject in subjects
+        ])
+
+        conn.commit()
+        clear_cached_reads()
+        logger.info(
+            f"Subject selections saved for {len(targets)} student(s) "
+            f"in {class_name} / {term}"
+        )
+        return len(targets)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def get_student_selection_summary(class_name, term, session):
+    """
+    Get one summary row per enrolled student, grouped in SQL.
+
+    Returns:
+        list of (student_name, subjects, subject_count) tuples ordered by
+        student name — subjects is a ", "-joined string of the student's
+        selected subjects (alphabetical), or None when they have none.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT css.student_name,
+               GROUP_CONCAT(sel.subject_name, ', '),
+               COUNT(sel.subject_name)
+        FROM   class_session_students css
+        JOIN   class_sessions cs ON cs.id = css.class_session_id
+        LEFT JOIN (
+            SELECT enrollment_id, subject_name
+            FROM   student_subject_selections
+            WHERE  term = ?
+            ORDER  BY subject_name
+        ) sel ON sel.enrollment_id = css.id
+        WHERE  cs.class_name = ? AND cs.session = ? AND css.term = ?
+        GROUP  BY css.id
+        ORDER  BY css.student_name
+    """, (term, class_name, session, term))
+    rows = [tuple(r) for r in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
 def get_all_student_subject_selections(class_name, term, session):
     """
     Get all student subject selections for a class.
@@ -38,6 +38,8 @@ def create_subject(subject_name: str, class_name: str) -> bool:
     Returns:
         True if created, False if already exists.
     """
+    from .cache import clear_cached_reads
+
     conn = get_connection()
     cursor = conn.cursor()
     try:
@@ -46,6 +48,7 @@ def create_subject(subject_name: str, class_name: str) -> bool:
             VALUES (?, ?)
         """, (subject_name.strip(), class_name))
         conn.commit()
+        clear_cached_reads()
         logger.info(f"Subject '{subject_name}' created for class '{class_name}'")
         return True
     except sqlite3.IntegrityError:
@@ -55,6 +58,48 @@ def create_subject(subject_name: str, class_name: str) -> bool:
         conn.close()
 
 
+def create_subjects_bulk(subject_names: list, class_name: str) -> tuple:
+    """
+    Create several subjects for a class in a single statement.
+
+    Names that already exist for the class are left untouched — the
+    UNIQUE(class_name, subject_name) constraint decides, so concurrent
+    adds from another session are reported as skipped rather than racing
+    a Python-side existence check.
+
+    Returns:
+        (added, skipped) — lists of subject names, in input order.
+    """
+    from .cache import clear_cached_reads
+
+    names = list(dict.fromkeys(name.strip() for name in subject_names))
+    if not names:
+        return [], []
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            INSERT INTO subjects (subject_name, class_name)
+            VALUES {", ".join(["(?, ?)"] * len(names))}
+            ON CONFLICT(class_name, subject_name) DO NOTHING
+            RETURNING subject_name
+        """, [value for name in names for value in (name, class_name)])
+        inserted = {row[0] for row in cursor.fetchall()}
+        conn.commit()
+        clear_cached_reads()
+        added = [name for name in names if name in inserted]
+        skipped = [name for name in names if name not in inserted]
+        if added:
+            logger.info(f"{len(added)} subject(s) created for class '{class_name}'")
+        return added, skipped
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"Error creating subjects for '{class_name}': {e}")
+        return [], names
+    finally:
+        conn.close()
+
+
 def update_subject(subject_id: int, new_subject_name: str, class_name: str) -> bool:
     """
     Update an existing subject's name.
@@ -62,6 +107,8 @@ def update_subject(subject_id: int, new_subject_name: str, class_name: str) -> b
     Returns:
         True if updated, False on conflict or error.
     """
+    from .cache import clear_cached_reads
+
     conn = get_connection()
     cursor = conn.cursor()
     try:
@@ -71,6 +118,7 @@ def update_subject(subject_id: int, new_subject_name: str, class_name: str) -> b
             WHERE  id = ?
         """, (new_subject_name.strip(), class_name, subject_id))
         conn.commit()
+        clear_cached_reads()
         logger.info(f"Subject ID {subject_id} updated to '{new_subject_name}'")
         return True
     except sqlite3.IntegrityError:
@@ -80,6 +128,54 @@ def update_subject(subject_id: int, new_subject_name: str, class_name: str) -> b
         conn.close()
 
 
+def save_subject_changes(renames: dict, delete_ids: list, class_name: str) -> bool:
+    """
+    Apply a batch of subject renames and deletions in a single transaction.
+
+    Deletions run first, so a subject may take the name of one being
+    deleted. Renames go through temporary names first, so chains and
+    swaps (A→B, B→C) never collide part-way. Any failure rolls back the
+    whole batch.
+
+    Args:
+        renames:    {subject_id: new_subject_name}
+        delete_ids: subject ids to delete
+        class_name: class the subjects belong to
+
+    Returns:
+        True if everything was applied, False if nothing was.
+    """
+    from .cache import clear_cached_reads
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.executemany(
+            "DELETE FROM subjects WHERE id = ? AND class_name = ?",
+            [(subject_id, class_name) for subject_id in delete_ids],
+        )
+        cursor.executemany(
+            "UPDATE subjects SET subject_name = ? WHERE id = ? AND class_name = ?",
+            [(f"\x00rename-{subject_id}", subject_id, class_name) for subject_id in renames],
+        )
+        cursor.executemany(
+            "UPDATE subjects SET subject_name = ? WHERE id = ? AND class_name = ?",
+            [(name.strip(), subject_id, class_name) for subject_id, name in renames.items()],
+        )
+        conn.commit()
+        clear_cached_reads()
+        logger.info(
+            f"Subjects for '{class_name}': {len(renames)} renamed, {len(delete_ids)} deleted"
+        )
+        return True
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.warning(f"Failed to save subject changes for '{class_name}': {e}")
+        return False
+    finally:
+        conn.close()
+
+
 def delete_subject(subject_id: int) -> bool:
     """
     Delete a subject by ID.
@@ -87,11 +183,14 @@ def delete_subject(subject_id: int) -> bool:
     Returns:
         True if a row was deleted, False otherwise.
     """
+    from .cache import clear_cached_reads
+
     conn = get_connection()
     cursor = conn.cursor()
     try:
         cursor.execute("DELETE FROM subjects WHERE id = ?", (subject_id,))
         conn.commit()
+        clear_cached_reads()
         deleted = cursor.rowcount > 0
         if deleted:
             logger.info(f"Subject ID {subject_id} deleted")
@@ -110,11 +209,14 @@ def clear_all_subjects(class_name: str) -> bool:
     Returns:
         True if successful, False on error.
     """
+    from .cache import clear_cached_reads
+
     conn = get_connection()
     cursor = conn.cursor()
     try:
         cursor.execute("DELETE FROM subjects WHERE class_name = ?", (class_name,))
         conn.commit()
+        clear_cached_reads()
         logger.warning(f"All subjects cleared for class '{class_name}'")
         return True
     except sqlite3.Error as e:
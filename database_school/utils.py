@@ -2,10 +2,9 @@
 
 """Database utility functions - stats, validation, backup/restore, migrations"""
 
-import shutil
 import sqlite3
 import logging
-from .connection import get_connection, DB_PATH, BACKUP_PATH
+from .connection import get_connection, close_pool, DB_PATH, BACKUP_PATH
 import json
 
 logger = logging.getLogger(__name__)
@@ -89,6 +88,23 @@ def get_classes_summary():
     return [dict(r) for r in rows]
 
 
+def _copy_database(src_path, dest_path):
+    """
+    Copy one SQLite database into another with the online backup API.
+
+    Unlike a raw file copy this includes commits still sitting in the
+    source's -wal file (pooled connections keep it from being
+    checkpointed) and writes the destination through its own journal.
+    """
+    src = sqlite3.connect(src_path)
+    dest = sqlite3.connect(dest_path)
+    try:
+        src.backup(dest)
+    finally:
+        dest.close()
+        src.close()
+
+
 def backup_database(backup_path):
     """
     Create a backup of the database
@@ -100,7 +116,7 @@ def backup_database(backup_path):
         bool: True if successful, False otherwise
     """
     try:
-        shutil.copy2(DB_PATH, backup_path)
+        _copy_database(DB_PATH, backup_path)
         logger.info(f"Database backed up to {backup_path}")
         return True
     except Exception as e:
@@ -119,7 +135,8 @@ def restore_database(backup_path):
         bool: True if successful, False otherwise
     """
     try:
-        shutil.copy2(backup_path, DB_PATH)
+        close_pool(DB_PATH)
+        _copy_database(backup_path, DB_PATH)
         logger.info(f"Database restored from {backup_path}")
         return True
     except Exception as e:
@@ -329,7 +346,7 @@ def migrate_reduce_next_term_info_table():
     backup_path = DB_PATH + ".bak"
 
     try:
-        shutil.copy2(DB_PATH, backup_path)
+        _copy_database(DB_PATH, backup_path)
         logger.info(f"Backup created at: {backup_path}")
     except Exception as e:
         logger.error(f"Backup failed: {e}")
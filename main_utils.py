@@ -4,6 +4,7 @@ import re
 import json
 import os
 import streamlit as st
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -13,20 +14,23 @@ def get_project_root():
     return Path(__file__).resolve().parent
 
 
+@st.cache_resource(show_spinner=False)
+def _read_css(absolute_path):
+    """Read a CSS file once per process; stylesheets are static for the app's lifetime"""
+    if absolute_path.exists():
+        with open(absolute_path, 'r') as f:
+            return f.read()
+    # st.warning(f"CSS file not found: {file_path}")
+    return ""
+
+
 def load_css(file_path):
     """Load CSS from external file with absolute path handling"""
     try:
         # Convert to absolute path
         project_root = get_project_root()
         absolute_path = project_root / file_path
-        
-        if absolute_path.exists():
-            with open(absolute_path, 'r') as f:
-                css_content = f.read()
-            return css_content
-        else:
-            # st.warning(f"CSS file not found: {file_path}")
-            return ""
+        return _read_css(absolute_path)
     except Exception as e:
         st.error(f"Error loading CSS file {file_path}: {str(e)}")
         return ""
@@ -241,6 +245,18 @@ def format_ordinal(n):
     return f"{n}{suffix}"
 
 
+@lru_cache(maxsize=64)
+def _page_header_html(title, background_color, text_color, font_size):
+    """Build the page header markup once per distinct (title, style) combination"""
+    return f"""
+        <div style='width: auto; margin: auto; text-align: center; background-color: {background_color};'>
+            <h2 style='color:{text_color}; font-size:{font_size}; margin-top:0; margin-bottom:20px;'>
+                {title}
+            </h2>
+        </div>
+        """
+
+
 def render_page_header(title, background_color="#c6b7b1", text_color="#000", font_size="24px"):
     """
     Renders a styled page header
@@ -252,13 +268,7 @@ def render_page_header(title, background_color="#c6b7b1", text_color="#000", fon
         font_size (str): Font size (default: 24px)
     """
     st.markdown(
-        f"""
-        <div style='width: auto; margin: auto; text-align: center; background-color: {background_color};'>
-            <h2 style='color:{text_color}; font-size:{font_size}; margin-top:0; margin-bottom:20px;'>
-                {title}
-            </h2>
-        </div>
-        """,
+        _page_header_html(title, background_color, text_color, font_size),
         unsafe_allow_html=True
     )
 
@@ -321,12 +331,8 @@ def render_persistent_class_selector(classes: List[Dict[str, Any]],
         or st.session_state.class_selection_state.get("class_name")
     )
 
-    default_index = 0
-    if last_selection and last_selection in class_options:
-        try:
-            default_index = class_options.index(last_selection)
-        except ValueError:
-            default_index = 0
+    class_index   = {name: i for i, name in enumerate(class_options)}
+    default_index = class_index.get(last_selection, 0)
 
     def on_class_change():
         selected = st.session_state[widget_key]
@@ -431,7 +437,7 @@ def render_class_term_session_selector(
     from database_school import (
         get_active_session, get_active_term_name,
         get_all_sessions, get_classes_for_session,
-        get_all_classes, get_user_assignments,
+        get_all_classes_cached, get_user_assignments,
     )
 
     # Ensure persistence store exists
@@ -463,7 +469,7 @@ def render_class_term_session_selector(
             st.warning("⚠️ No sessions found. Please configure an academic session.")
             return None
 
-        _all_classes = get_all_classes() or []
+        _all_classes = get_all_classes_cached() or []
         _class_names = [c["class_name"] for c in _all_classes]
         if not _class_names:
             st.warning("⚠️ No classes found. Create a class first.")
@@ -503,12 +509,11 @@ def render_class_term_session_selector(
         # (avoids overriding the user's selection with the persisted value on re-render).
         # Only fall back to _saved_class on the very first render of this widget.
         _widget_key = f"{page_key}_class"
-        if _widget_key in st.session_state and st.session_state[_widget_key] in display_class_names:
-            _class_idx = display_class_names.index(st.session_state[_widget_key])
-        elif _saved_class and _saved_class in display_class_names:
-            _class_idx = display_class_names.index(_saved_class)
-        else:
-            _class_idx = 0
+        _class_index = {name: i for i, name in enumerate(display_class_names)}
+        _class_idx = _class_index.get(
+            st.session_state.get(_widget_key),
+            _class_index.get(_saved_class, 0),
+        )
 
         with _col_class:
             class_name = st.selectbox(
@@ -547,12 +552,11 @@ def render_class_term_session_selector(
 
         # Use the widget's own session_state value if it already exists
         _widget_key = f"{page_key}_class"
-        if _widget_key in st.session_state and st.session_state[_widget_key] in assigned_classes:
-            _class_idx = assigned_classes.index(st.session_state[_widget_key])
-        elif _saved_class and _saved_class in assigned_classes:
-            _class_idx = assigned_classes.index(_saved_class)
-        else:
-            _class_idx = 0
+        _class_index = {name: i for i, name in enumerate(assigned_classes)}
+        _class_idx = _class_index.get(
+            st.session_state.get(_widget_key),
+            _class_index.get(_saved_class, 0),
+        )
 
         # 3-column layout: Class (interactive) | Term (locked) | Session (locked)
         _col_class, _col_term, _col_session = st.columns(3)
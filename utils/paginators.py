@@ -8,9 +8,11 @@ import pandas as pd
 
 logger = logging.getLogger(__name__)
 
-def streamlit_paginator(data, table_name):
+def streamlit_paginator(data, table_name, column_config=None):
     """
     Paginator with search and filter functionality for streamlit dataframes
+
+    column_config is passed through to st.dataframe for the current page.
     """
     # Convert to DataFrame if not already
     df = pd.DataFrame(data) if not isinstance(data, pd.DataFrame) else data.copy()
@@ -150,6 +152,7 @@ def streamlit_paginator(data, table_name):
     if len(page_data) > 0:
         st.dataframe(
             page_data, 
+            column_config=column_config,
             width="stretch", 
             hide_index=True,
             height=40*table_height